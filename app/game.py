@@ -1,9 +1,23 @@
-import pygame
+import itertools
 import random
-from enum import Enum
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import IntEnum
+from typing import ClassVar
+
+import numpy as np
+import numpy.typing as npt
+import pygame
+
+# Cell values in SnakeGame.grid
+EMPTY: int = 0
+BODY: int = 1
+HEAD: int = 2
+FOOD: int = 3
 
 
-class Direction(Enum):
+class Direction(IntEnum):
     UP = 1
     DOWN = 2
     LEFT = 3
@@ -11,6 +25,30 @@ class Direction(Enum):
 
 
 class SnakeGame:
+    _DELTAS: ClassVar[dict[Direction, tuple[int, int]]] = {
+        Direction.UP: (0, -1),
+        Direction.DOWN: (0, 1),
+        Direction.LEFT: (-1, 0),
+        Direction.RIGHT: (1, 0),
+    }
+    _KEY_DIR: ClassVar[dict[int, Direction]] = {
+        pygame.K_UP: Direction.UP,
+        pygame.K_DOWN: Direction.DOWN,
+        pygame.K_LEFT: Direction.LEFT,
+        pygame.K_RIGHT: Direction.RIGHT,
+    }
+    _OPPOSITE: ClassVar[dict[Direction, Direction]] = {
+        Direction.UP: Direction.DOWN,
+        Direction.DOWN: Direction.UP,
+        Direction.LEFT: Direction.RIGHT,
+        Direction.RIGHT: Direction.LEFT,
+    }
+    _EVENT_TYPES: ClassVar[list[int]] = [
+        pygame.QUIT,
+        pygame.KEYDOWN,
+        pygame.WINDOWEXPOSED,
+    ]
+
     def __init__(self) -> None:
         pygame.init()
 
@@ -31,37 +69,167 @@ class SnakeGame:
         # Setup display
         self.screen = pygame.display.set_mode((self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
         pygame.display.set_caption("Snake Game")
+        # Keep mouse motion and other unused events out of the queue entirely
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self._EVENT_TYPES)
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 36)
 
-        # Game state
+        # Static overlay text never changes, so rasterize and position it once
+        center_x: int = self.WINDOW_WIDTH // 2
+        center_y: int = self.WINDOW_HEIGHT // 2
+        self._pause_surf = self.font.render("PAUSED", True, self.WHITE)
+        self._pause_rect = self._pause_surf.get_rect(center=(center_x, center_y - 40))
+        self._continue_surf = self.font.render(
+            "Press SPACE to continue", True, self.WHITE
+        )
+        self._continue_rect = self._continue_surf.get_rect(
+            center=(center_x, center_y + 10)
+        )
+        self._quit_surf = self.font.render("Press Q to quit", True, self.WHITE)
+        self._quit_rect = self._quit_surf.get_rect(center=(center_x, center_y + 50))
+        self._gameover_surf = self.font.render("GAME OVER!", True, self.RED)
+        self._gameover_rect = self._gameover_surf.get_rect(
+            center=(center_x, center_y - 20)
+        )
+        self._restart_surf = self.font.render(
+            "Press SPACE to restart", True, self.WHITE
+        )
+        self._restart_rect = self._restart_surf.get_rect(
+            center=(center_x, center_y + 20)
+        )
+
+        # Score is drawn from a fixed palette: the label plus one surface per digit.
+        # Digit positions come from the font's layout of the whole string, so the
+        # result matches font.render(f"Score: {n}"); they are recomputed (without
+        # rasterizing) only when the score changes.
+        self._score_label = self.font.render("Score: ", True, self.WHITE)
+        self._score_label_height: int = self._score_label.get_height()
+        self._digit_surfs: list[pygame.Surface] = [
+            self.font.render(str(digit), True, self.WHITE) for digit in range(10)
+        ]
+        self._digit_widths: list[int] = [surf.get_width() for surf in self._digit_surfs]
+        self._laid_out_score: int = -1
+        self._score_blits: list[tuple[pygame.Surface, tuple[int, int]]] = []
+        self._score_text_width: int = 0
+
+        # Pre-filled body tile so all segments go out in one blits call
+        self._body_surf = pygame.Surface((self.GRID_SIZE - 2, self.GRID_SIZE - 2))
+        self._body_surf.fill(self.DARK_GREEN)
+
+        # Pixel rect for every grid cell, indexed [y][x], so draw does no arithmetic
+        tile: int = self.GRID_SIZE - 2
+        self._cell_rects: list[list[tuple[int, int, int, int]]] = [
+            [
+                (x * self.GRID_SIZE, y * self.GRID_SIZE, tile, tile)
+                for x in range(self.GRID_WIDTH)
+            ]
+            for y in range(self.GRID_HEIGHT)
+        ]
+        # Whole-cell bounds, gaps included, for erasing a cell during dirty redraws
+        self._cell_bounds: list[list[tuple[int, int, int, int]]] = [
+            [
+                (x * self.GRID_SIZE, y * self.GRID_SIZE, self.GRID_SIZE, self.GRID_SIZE)
+                for x in range(self.GRID_WIDTH)
+            ]
+            for y in range(self.GRID_HEIGHT)
+        ]
+
+        # Game state; food starts off the board until reset_game places it
+        self._food: tuple[int, int] = (-1, -1)
+
+        # What the screen currently shows; nothing until the first full repaint
+        self._repaint_all: bool = True
+        self._changed_cells: set[tuple[int, int]] = set()
+        self._drawn_head: tuple[int, int] = (-1, -1)
+        self._drawn_food: tuple[int, int] = (-1, -1)
+        self._drawn_score: int = -1
+        self._drawn_score_width: int = 0
+        self._drawn_overlay: tuple[bool, bool] = (False, False)
         self.reset_game()
 
-    def reset_game(self) -> None:
-        self.snake: list[tuple[int, int]] = [
-            (self.GRID_WIDTH // 2, self.GRID_HEIGHT // 2)
+    @property
+    def snake(self) -> deque[tuple[int, int]]:
+        return self._snake
+
+    @snake.setter
+    def snake(self, segments: Iterable[tuple[int, int]]) -> None:
+        # Rebuild the grid and free-cell list whenever the body is replaced wholesale
+        self._snake: deque[tuple[int, int]] = deque(segments)
+        # ...and repaint the whole screen, since the old frame no longer applies
+        self._repaint_all = True
+        self._changed_cells = set()
+        self.grid: npt.NDArray[np.uint8] = np.zeros(
+            (self.GRID_HEIGHT, self.GRID_WIDTH), dtype=np.uint8
+        )
+        for x, y in self._snake:
+            self.grid[y, x] = BODY
+        head_x, head_y = self._snake[0]
+        self.grid[head_y, head_x] = HEAD
+        food: tuple[int, int] = self._food
+        if self._on_grid(food) and self.grid[food[1], food[0]] == EMPTY:
+            self.grid[food[1], food[0]] = FOOD
+
+        occupied: set[tuple[int, int]] = set(self._snake)
+        self.free_cells: list[tuple[int, int]] = [
+            (x, y)
+            for y in range(self.GRID_HEIGHT)
+            for x in range(self.GRID_WIDTH)
+            if (x, y) not in occupied
         ]
+        self.free_index: dict[tuple[int, int], int] = {
+            cell: i for i, cell in enumerate(self.free_cells)
+        }
+
+    @property
+    def food(self) -> tuple[int, int]:
+        return self._food
+
+    @food.setter
+    def food(self, cell: tuple[int, int]) -> None:
+        old: tuple[int, int] = self._food
+        if self._on_grid(old) and self.grid[old[1], old[0]] == FOOD:
+            self.grid[old[1], old[0]] = EMPTY
+        self._food = cell
+        if self._on_grid(cell):
+            self.grid[cell[1], cell[0]] = FOOD
+
+    def _on_grid(self, cell: tuple[int, int]) -> bool:
+        return 0 <= cell[0] < self.GRID_WIDTH and 0 <= cell[1] < self.GRID_HEIGHT
+
+    def _occupy(self, cell: tuple[int, int]) -> None:
+        # Swap-remove so taking a cell out of the free list is O(1)
+        index: int = self.free_index.pop(cell)
+        last: tuple[int, int] = self.free_cells.pop()
+        if last != cell:
+            self.free_cells[index] = last
+            self.free_index[last] = index
+
+    def _vacate(self, cell: tuple[int, int]) -> None:
+        self.free_index[cell] = len(self.free_cells)
+        self.free_cells.append(cell)
+
+    def reset_game(self) -> None:
+        self.snake = [(self.GRID_WIDTH // 2, self.GRID_HEIGHT // 2)]
         self.direction: Direction = Direction.RIGHT
         self.next_direction: Direction = Direction.RIGHT
-        self.food: tuple[int, int] = self.spawn_food()
+        self.food = self.spawn_food()
         self.score: int = 0
         self.game_over: bool = False
         self.paused: bool = False
 
     def spawn_food(self) -> tuple[int, int]:
-        while True:
-            food: tuple[int, int] = (
-                random.randint(0, self.GRID_WIDTH - 1),
-                random.randint(0, self.GRID_HEIGHT - 1),
-            )
-            if food not in self.snake:
-                return food
+        return random.choice(self.free_cells)
 
     def handle_input(self) -> bool:
-        for event in pygame.event.get():
+        for event in pygame.event.get(self._EVENT_TYPES):
             if event.type == pygame.QUIT:
                 return False
 
+            # Window contents were lost (uncovered/restored): present a full frame
+            if event.type == pygame.WINDOWEXPOSED:
+                self._repaint_all = True
+
             if event.type == pygame.KEYDOWN:
                 if self.game_over:
                     if event.key == pygame.K_SPACE:
@@ -72,26 +240,12 @@ class SnakeGame:
                     elif self.paused and event.key == pygame.K_q:
                         return False
                     elif not self.paused:
+                        new_direction: Direction | None = self._KEY_DIR.get(event.key)
                         if (
-                            event.key == pygame.K_UP
-                            and self.direction != Direction.DOWN
-                        ):
-                            self.next_direction = Direction.UP
-                        elif (
-                            event.key == pygame.K_DOWN
-                            and self.direction != Direction.UP
+                            new_direction is not None
+                            and self._OPPOSITE[new_direction] != self.direction
                         ):
-                            self.next_direction = Direction.DOWN
-                        elif (
-                            event.key == pygame.K_LEFT
-                            and self.direction != Direction.RIGHT
-                        ):
-                            self.next_direction = Direction.LEFT
-                        elif (
-                            event.key == pygame.K_RIGHT
-                            and self.direction != Direction.LEFT
-                        ):
-                            self.next_direction = Direction.RIGHT
+                            self.next_direction = new_direction
 
         return True
 
@@ -99,21 +253,21 @@ class SnakeGame:
         if self.game_over or self.paused:
             return
 
-        self.direction = self.next_direction
+        # Bind hot attributes to locals once; the body below only touches these
+        snake: deque[tuple[int, int]] = self.snake
+        grid: npt.NDArray[np.uint8] = self.grid
+        direction: Direction = self.next_direction
+        self.direction = direction
 
         # Calculate new head position
-        head_x: int
-        head_y: int
-        head_x, head_y = self.snake[0]
-
-        if self.direction == Direction.UP:
-            head_y -= 1
-        elif self.direction == Direction.DOWN:
-            head_y += 1
-        elif self.direction == Direction.LEFT:
-            head_x -= 1
-        elif self.direction == Direction.RIGHT:
-            head_x += 1
+        old_x: int
+        old_y: int
+        old_x, old_y = snake[0]
+        dx: int
+        dy: int
+        dx, dy = SnakeGame._DELTAS[direction]
+        head_x: int = old_x + dx
+        head_y: int = old_y + dy
 
         new_head: tuple[int, int] = (head_x, head_y)
 
@@ -128,106 +282,231 @@ class SnakeGame:
             return
 
         # Check self collision
-        if new_head in self.snake:
+        if BODY <= grid[head_y, head_x] <= HEAD:
             self.game_over = True
             return
 
-        # Add new head
-        self.snake.insert(0, new_head)
+        # Add new head, demoting the old one to body
+        grid[old_y, old_x] = BODY
+        grid[head_y, head_x] = HEAD
+        snake.appendleft(new_head)
+        self._occupy(new_head)
+        self._changed_cells.add(new_head)
 
         # Check food collision
         if new_head == self.food:
             self.score += 1
+            if not self.free_cells:
+                # The snake fills the board: nothing left to eat, so the game ends
+                self.game_over = True
+                return
             self.food = self.spawn_food()
         else:
             # Remove tail if no food eaten
-            self.snake.pop()
+            tail: tuple[int, int] = snake.pop()
+            grid[tail[1], tail[0]] = EMPTY
+            self._vacate(tail)
+            self._changed_cells.add(tail)
 
     def draw(self) -> None:
-        self.screen.fill(self.BLACK)
-
-        # Draw snake
-        for i, segment in enumerate(self.snake):
-            x: int
-            y: int
-            x, y = segment
-            color = self.GREEN if i == 0 else self.DARK_GREEN
-            pygame.draw.rect(
-                self.screen,
-                color,
-                (
-                    x * self.GRID_SIZE,
-                    y * self.GRID_SIZE,
-                    self.GRID_SIZE - 2,
-                    self.GRID_SIZE - 2,
-                ),
-            )
+        self._present(self.render())
+
+    def _present(self, dirty: list[tuple[int, int, int, int]] | None) -> None:
+        if dirty is None:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
+
+    def render(self) -> list[tuple[int, int, int, int]] | None:
+        # Paint the current state onto the screen surface. Returns the screen
+        # rects that changed, or None when the whole screen was repainted.
+        if self._repaint_all or (self.paused, self.game_over) != self._drawn_overlay:
+            self._render_full()
+            return None
+
+        stale: bool = (
+            bool(self._changed_cells)
+            or self.snake[0] != self._drawn_head
+            or self.food != self._drawn_food
+            or self.score != self._drawn_score
+        )
+        if not stale:
+            return []
+        # Overlays sit on top of the board, so repaint everything under them
+        if self.paused or self.game_over:
+            self._render_full()
+            return None
+        return self._render_dirty()
+
+    def _render_full(self) -> None:
+        screen: pygame.Surface = self.screen
+        blit = screen.blit
+        draw_rect = pygame.draw.rect
+        cell_rects: list[list[tuple[int, int, int, int]]] = self._cell_rects
+
+        screen.fill(self.BLACK)
+
+        # Draw snake: body segments in one blits call, then the head on top
+        snake: deque[tuple[int, int]] = self.snake
+        body_surf: pygame.Surface = self._body_surf
+        screen.blits(
+            [
+                (body_surf, cell_rects[y][x])
+                for x, y in itertools.islice(snake, 1, None)
+            ],
+            doreturn=False,
+        )
+        head_x: int
+        head_y: int
+        head_x, head_y = snake[0]
+        draw_rect(screen, self.GREEN, cell_rects[head_y][head_x])
 
-        # Draw food
+        # Draw food, unless the snake filled the board and its head sits on it
         fx: int
         fy: int
         fx, fy = self.food
-        pygame.draw.rect(
-            self.screen,
-            self.RED,
-            (
-                fx * self.GRID_SIZE,
-                fy * self.GRID_SIZE,
-                self.GRID_SIZE - 2,
-                self.GRID_SIZE - 2,
-            ),
-        )
+        if (fx, fy) != (head_x, head_y):
+            draw_rect(screen, self.RED, cell_rects[fy][fx])
 
         # Draw score
-        score_text = self.font.render(f"Score: {self.score}", True, self.WHITE)
-        self.screen.blit(score_text, (10, 10))
+        self._blit_score()
 
         # Draw pause screen
         if self.paused:
-            pause_text = self.font.render("PAUSED", True, self.WHITE)
-            continue_text = self.font.render(
-                "Press SPACE to continue", True, self.WHITE
-            )
-            quit_text = self.font.render("Press Q to quit", True, self.WHITE)
-
-            text_rect = pause_text.get_rect(
-                center=(self.WINDOW_WIDTH // 2, self.WINDOW_HEIGHT // 2 - 40)
-            )
-            continue_rect = continue_text.get_rect(
-                center=(self.WINDOW_WIDTH // 2, self.WINDOW_HEIGHT // 2 + 10)
-            )
-            quit_rect = quit_text.get_rect(
-                center=(self.WINDOW_WIDTH // 2, self.WINDOW_HEIGHT // 2 + 50)
-            )
-
-            self.screen.blit(pause_text, text_rect)
-            self.screen.blit(continue_text, continue_rect)
-            self.screen.blit(quit_text, quit_rect)
+            blit(self._pause_surf, self._pause_rect)
+            blit(self._continue_surf, self._continue_rect)
+            blit(self._quit_surf, self._quit_rect)
 
         # Draw game over screen
         if self.game_over:
-            game_over_text = self.font.render("GAME OVER!", True, self.RED)
-            restart_text = self.font.render("Press SPACE to restart", True, self.WHITE)
-
-            text_rect = game_over_text.get_rect(
-                center=(self.WINDOW_WIDTH // 2, self.WINDOW_HEIGHT // 2 - 20)
-            )
-            restart_rect = restart_text.get_rect(
-                center=(self.WINDOW_WIDTH // 2, self.WINDOW_HEIGHT // 2 + 20)
+            blit(self._gameover_surf, self._gameover_rect)
+            blit(self._restart_surf, self._restart_rect)
+
+        self._repaint_all = False
+        self._mark_drawn()
+
+    def _render_dirty(self) -> list[tuple[int, int, int, int]]:
+        screen: pygame.Surface = self.screen
+        blit = screen.blit
+        fill = screen.fill
+        draw_rect = pygame.draw.rect
+        cell_rects: list[list[tuple[int, int, int, int]]] = self._cell_rects
+        cell_bounds: list[list[tuple[int, int, int, int]]] = self._cell_bounds
+        body_surf: pygame.Surface = self._body_surf
+        grid: npt.NDArray[np.uint8] = self.grid
+        black: tuple[int, int, int] = self.BLACK
+
+        # Cells touched by update plus where the head and food were and are now
+        dirty_cells: set[tuple[int, int]] = set(self._changed_cells)
+        dirty_cells.add(self._drawn_head)
+        dirty_cells.add(self.snake[0])
+        if self.food != self._drawn_food:
+            dirty_cells.add(self._drawn_food)
+            dirty_cells.add(self.food)
+
+        # The score overlaps the top-left cells: repaint those and re-blit it
+        # whenever the text changes or anything under it was repainted
+        score_width: int = self._score_width()
+        score_cells: set[tuple[int, int]] = self._score_cells(
+            max(score_width, self._drawn_score_width)
+        )
+        redraw_score: bool = self.score != self._drawn_score or not (
+            dirty_cells.isdisjoint(score_cells)
+        )
+        if redraw_score:
+            dirty_cells |= score_cells
+
+        dirty: list[tuple[int, int, int, int]] = []
+        for cell in dirty_cells:
+            if not self._on_grid(cell):
+                continue
+            x, y = cell
+            bounds: tuple[int, int, int, int] = cell_bounds[y][x]
+            fill(black, bounds)
+            value: int = grid[y, x]
+            if value == BODY:
+                blit(body_surf, cell_rects[y][x])
+            elif value == HEAD:
+                draw_rect(screen, self.GREEN, cell_rects[y][x])
+            elif value == FOOD:
+                draw_rect(screen, self.RED, cell_rects[y][x])
+            dirty.append(bounds)
+
+        if redraw_score:
+            self._blit_score()
+
+        self._mark_drawn()
+        return dirty
+
+    def _mark_drawn(self) -> None:
+        self._changed_cells.clear()
+        self._drawn_head = self.snake[0]
+        self._drawn_food = self.food
+        self._drawn_score = self.score
+        self._drawn_score_width = self._score_width()
+        self._drawn_overlay = (self.paused, self.game_over)
+
+    def _blit_score(self) -> None:
+        self._layout_score()
+        self.screen.blits(self._score_blits, doreturn=False)
+
+    def _score_width(self) -> int:
+        self._layout_score()
+        return self._score_text_width
+
+    def _layout_score(self) -> None:
+        score: int = self.score
+        if score == self._laid_out_score:
+            return
+        # Right-align each digit to where the font ends "Score: <prefix>", which
+        # reproduces the fractional advances of a whole-string render
+        size = self.font.size
+        text: str = "Score: " + str(score)
+        blits: list[tuple[pygame.Surface, tuple[int, int]]] = [
+            (self._score_label, (10, 10))
+        ]
+        for end in range(len("Score: ") + 1, len(text) + 1):
+            digit: int = ord(text[end - 1]) - 48
+            right: int = size(text[:end])[0]
+            blits.append(
+                (self._digit_surfs[digit], (10 + right - self._digit_widths[digit], 10))
             )
-
-            self.screen.blit(game_over_text, text_rect)
-            self.screen.blit(restart_text, restart_rect)
-
-        pygame.display.flip()
-
-    def run(self) -> None:
+        self._score_blits = blits
+        self._score_text_width = size(text)[0]
+        self._laid_out_score = score
+
+    def _score_cells(self, width: int) -> set[tuple[int, int]]:
+        # Grid cells covered by score text of the given width drawn at (10, 10)
+        grid_size: int = self.GRID_SIZE
+        return {
+            (x, y)
+            for y in range((10 + self._score_label_height - 1) // grid_size + 1)
+            for x in range((10 + width - 1) // grid_size + 1)
+        }
+
+    def run(self, fps: int = 10, pipelined: bool = False) -> None:
         running: bool = True
 
-        while running:
-            running = self.handle_input()
-            self.update()
-            self.draw()
-            self.clock.tick(10)
+        if not pipelined:
+            while running:
+                running = self.handle_input()
+                self.update()
+                self.draw()
+                self.clock.tick(fps)
+        else:
+            # Overlap the next tick's update with flip() and clock.tick(), which
+            # both release the GIL. Only worth it at high tick rates, and input
+            # lands one frame later than in the sequential loop.
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                while running:
+                    # Game state is quiescent here: the last update has joined
+                    running = self.handle_input()
+                    dirty = self.render()
+                    # The rendered surface is the snapshot, so update may now
+                    # mutate state while pixels go out; pygame stays on this thread
+                    pending: Future[None] = executor.submit(self.update)
+                    self._present(dirty)
+                    self.clock.tick(fps)
+                    pending.result()
 
         pygame.quit()
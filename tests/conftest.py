@@ -1,7 +1,9 @@
 """Shared fixtures for all tests."""
 
-import pytest
 from unittest.mock import Mock
+
+import pytest
+
 from app import Direction, SnakeGame
 
 
@@ -11,10 +13,15 @@ def mock_pygame(monkeypatch: pytest.MonkeyPatch) -> dict[str, Mock]:
     mock_display: Mock = Mock()
     mock_font: Mock = Mock()
     mock_clock: Mock = Mock()
+    mock_font.render.return_value.get_width.return_value = 10
+    mock_font.render.return_value.get_height.return_value = 10
+    mock_font.size.side_effect = lambda text: (10 * len(text), 10)
 
     monkeypatch.setattr("pygame.init", Mock())
     monkeypatch.setattr("pygame.display.set_mode", lambda x: mock_display)
     monkeypatch.setattr("pygame.display.set_caption", Mock())
+    monkeypatch.setattr("pygame.event.set_blocked", Mock())
+    monkeypatch.setattr("pygame.event.set_allowed", Mock())
     monkeypatch.setattr("pygame.font.Font", lambda x, y: mock_font)
     monkeypatch.setattr("pygame.time.Clock", lambda: mock_clock)
     monkeypatch.setattr("pygame.quit", Mock())
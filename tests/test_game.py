@@ -1,8 +1,16 @@
 """Comprehensive test suite for Snake game demonstrating pytest concepts."""
 
+from collections import deque
+from unittest.mock import Mock
+
+import numpy as np
+import pygame
 import pytest
+
 from app import Direction, SnakeGame
+from app.game import BODY, FOOD, HEAD
 
+REAL_FONT = pygame.font.Font
 
 # ============================================================================
 # 1. FIXTURES - Setup and Dependency Injection
@@ -25,6 +33,13 @@ def test_initial_snake_position(game: SnakeGame) -> None:
     assert game.snake[0] == (expected_x, expected_y)
 
 
+def test_direction_values_are_ints() -> None:
+    """Test directions compare and hash as the ints shared with snake_core."""
+    assert [int(d) for d in Direction] == [1, 2, 3, 4]
+    assert isinstance(Direction.RIGHT, int)
+    assert {4: "right"}[Direction.RIGHT] == "right"
+
+
 def test_food_not_on_snake(game: SnakeGame) -> None:
     """Test that food never spawns on snake body."""
     assert game.food not in game.snake
@@ -87,6 +102,37 @@ def test_cannot_reverse_direction(
     assert game.direction == current
 
 
+@pytest.mark.parametrize(
+    "current,key,expected",
+    [
+        (Direction.RIGHT, "K_UP", Direction.UP),
+        (Direction.RIGHT, "K_LEFT", Direction.RIGHT),
+        (Direction.UP, "K_DOWN", Direction.UP),
+        (Direction.UP, "K_LEFT", Direction.LEFT),
+        (Direction.LEFT, "K_RIGHT", Direction.LEFT),
+        (Direction.DOWN, "K_RIGHT", Direction.RIGHT),
+        (Direction.DOWN, "K_a", Direction.DOWN),
+    ],
+)
+def test_arrow_keys_set_next_direction(
+    game: SnakeGame,
+    monkeypatch: pytest.MonkeyPatch,
+    current: Direction,
+    key: str,
+    expected: Direction,
+) -> None:
+    """Test arrow keys steer the snake but never reverse it."""
+    import pygame
+
+    game.direction = current
+    game.next_direction = current
+    event = type("Event", (), {"type": pygame.KEYDOWN, "key": getattr(pygame, key)})()
+    monkeypatch.setattr("pygame.event.get", lambda eventtype=None: [event])
+
+    assert game.handle_input() is True
+    assert game.next_direction == expected
+
+
 # ============================================================================
 # 3. TESTING EXCEPTIONS AND EDGE CASES
 # ============================================================================
@@ -198,6 +244,34 @@ def test_self_collision(game_with_long_snake: SnakeGame) -> None:
     assert game.game_over is True
 
 
+def test_grid_tracks_body(game: SnakeGame) -> None:
+    """Test the cell grid mirrors the snake body and food as it moves and grows."""
+    game.snake = [(20, 5), (20, 4), (20, 3)]
+    game.direction = Direction.DOWN
+    game.next_direction = Direction.DOWN
+    game.food = (20, 6)
+
+    for _ in range(5):
+        game.update()
+
+    assert not game.game_over
+    head_x, head_y = game.snake[0]
+    assert game.grid[head_y, head_x] == HEAD
+    assert {(int(x), int(y)) for y, x in np.argwhere(game.grid == BODY)} == set(
+        list(game.snake)[1:]
+    )
+    assert np.count_nonzero(game.grid == FOOD) == 1
+    assert game.grid[game.food[1], game.food[0]] == FOOD
+
+
+def test_snake_assignment_is_deque(game: SnakeGame) -> None:
+    """Test assigning a list body is stored as a deque for O(1) head pushes."""
+    game.snake = [(5, 5), (5, 6)]
+    assert isinstance(game.snake, deque)
+    assert game.grid[5, 5] == HEAD
+    assert game.grid[6, 5] == BODY
+
+
 # ============================================================================
 # 5. MONKEYPATCHING - Mocking Dependencies
 # ============================================================================
@@ -210,17 +284,14 @@ def test_spawn_food_avoids_snake(
     # Arrange - set snake to occupy specific positions
     game.snake = [(5, 5), (5, 6), (5, 7)]
 
-    # Control random to first return snake position, then valid position
-    values = [(5, 5), (10, 10)]
-    call_index = [0]
+    # Capture the candidate pool handed to random.choice
+    pools: list[list[tuple[int, int]]] = []
 
-    def mock_randint(a: int, b: int) -> int:
-        value: tuple[int, int] = values[call_index[0] // 2]  # Each coord needs 2 calls
-        result: int = value[call_index[0] % 2]
-        call_index[0] += 1
-        return result
+    def mock_choice(cells: list[tuple[int, int]]) -> tuple[int, int]:
+        pools.append(list(cells))
+        return (10, 10)
 
-    monkeypatch.setattr("random.randint", mock_randint)
+    monkeypatch.setattr("random.choice", mock_choice)
 
     # Act
     food = game.spawn_food()
@@ -228,6 +299,81 @@ def test_spawn_food_avoids_snake(
     # Assert
     assert food == (10, 10)
     assert food not in game.snake
+    # One RNG call per spawn: no rejection sampling
+    assert len(pools) == 1
+    assert not set(pools[0]) & set(game.snake)
+    assert len(pools[0]) == game.GRID_WIDTH * game.GRID_HEIGHT - len(game.snake)
+
+
+def test_free_cells_track_body(game: SnakeGame) -> None:
+    """Test free-cell list and index stay consistent as the snake moves."""
+    game.snake = [(20, 5)]
+    game.direction = Direction.DOWN
+    game.next_direction = Direction.DOWN
+    game.food = (20, 7)
+
+    for _ in range(5):
+        game.update()
+
+    assert not set(game.free_cells) & set(game.snake)
+    assert len(game.free_cells) + len(game.snake) == (
+        game.GRID_WIDTH * game.GRID_HEIGHT
+    )
+    for cell, index in game.free_index.items():
+        assert game.free_cells[index] == cell
+
+
+def test_spawn_food_on_nearly_full_board(game: SnakeGame) -> None:
+    """Test food lands on the last free cell without rejection sampling."""
+    game.snake = [
+        (x, y)
+        for y in range(game.GRID_HEIGHT)
+        for x in range(game.GRID_WIDTH)
+        if (x, y) != (3, 4)
+    ]
+
+    assert game.spawn_food() == (3, 4)
+
+
+def test_eating_last_free_cell_ends_game(game: SnakeGame) -> None:
+    """Test filling the whole board ends the game instead of raising."""
+    # Serpentine path over every cell; the snake covers all but the last one
+    path: list[tuple[int, int]] = [
+        (x if y % 2 == 0 else game.GRID_WIDTH - 1 - x, y)
+        for y in range(game.GRID_HEIGHT)
+        for x in range(game.GRID_WIDTH)
+    ]
+    game.snake = list(reversed(path[:-1]))
+    game.food = path[-1]
+    game.direction = Direction.LEFT
+    game.next_direction = Direction.LEFT
+
+    game.update()
+
+    assert game.game_over is True
+    assert game.score == 1
+    assert game.snake[0] == path[-1]
+    assert game.free_cells == []
+
+
+def test_full_board_draws_head_over_eaten_food(
+    game: SnakeGame, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the winning frame shows the head, not food, on the last cell."""
+    draw_rect: Mock = Mock()
+    monkeypatch.setattr("pygame.draw.rect", draw_rect)
+    monkeypatch.setattr("pygame.display.flip", Mock())
+    game.snake = [
+        (x, y) for y in range(game.GRID_HEIGHT) for x in range(game.GRID_WIDTH)
+    ]
+    game._food = game.snake[0]
+    game.game_over = True
+
+    game.draw()
+
+    colors = [call.args[1] for call in draw_rect.call_args_list]
+    assert game.GREEN in colors
+    assert game.RED not in colors
 
 
 # ============================================================================
@@ -276,7 +422,7 @@ class TestPauseFeature:
         import pygame
 
         mock_event = type("Event", (), {"type": pygame.KEYDOWN, "key": pygame.K_q})()
-        monkeypatch.setattr("pygame.event.get", lambda: [mock_event])
+        monkeypatch.setattr("pygame.event.get", lambda eventtype=None: [mock_event])
 
         # Act
         result = game.handle_input()
@@ -285,6 +431,287 @@ class TestPauseFeature:
         assert result is False
 
 
+class TestDrawCaching:
+    """Tests for cached text rendering in draw."""
+
+    def test_draw_reuses_rendered_text(
+        self,
+        game: SnakeGame,
+        mock_pygame: dict[str, Mock],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test overlays and unchanged score are not re-rendered per frame."""
+        monkeypatch.setattr("pygame.draw.rect", Mock())
+        monkeypatch.setattr("pygame.display.flip", Mock())
+        font: Mock = mock_pygame["font"]
+        font.render.reset_mock()
+        game.paused = True
+
+        game.draw()
+        game.score = 1234567890
+        game.draw()
+
+        assert font.render.call_count == 0
+
+    def test_draw_does_not_recompute_overlay_rects(
+        self,
+        game: SnakeGame,
+        mock_pygame: dict[str, Mock],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test overlay text positions are computed once, not per frame."""
+        monkeypatch.setattr("pygame.draw.rect", Mock())
+        monkeypatch.setattr("pygame.display.flip", Mock())
+        get_rect: Mock = mock_pygame["font"].render.return_value.get_rect
+        get_rect.reset_mock()
+
+        game.paused = True
+        game.draw()
+        game.paused = False
+        game.game_over = True
+        game.draw()
+
+        get_rect.assert_not_called()
+
+    def test_score_digits_blitted_left_to_right(
+        self,
+        game: SnakeGame,
+        mock_pygame: dict[str, Mock],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test digits are right-aligned to the font's layout of the full string."""
+        monkeypatch.setattr("pygame.draw.rect", Mock())
+        monkeypatch.setattr("pygame.display.flip", Mock())
+        screen: Mock = mock_pygame["display"]
+        game.score = 42
+
+        game.draw()
+
+        (blits,) = screen.blits.call_args.args
+        # Mocked layout: 10px per character; mocked digit surfaces are 10px wide
+        assert [dest for _, dest in blits] == [(10, 10), (80, 10), (90, 10)]
+
+    def test_score_matches_whole_string_render(
+        self, game: SnakeGame, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test composed digits are pixel-identical to rendering the score text."""
+        import pygame
+
+        pygame.font.init()
+        monkeypatch.setattr("pygame.font.Font", REAL_FONT)
+        game = SnakeGame()
+        game.screen = pygame.Surface((400, 40))
+
+        for score in [*range(200), 1111, 987654321]:
+            game.score = score
+            game.screen.fill(game.BLACK)
+            game._blit_score()
+            expected = pygame.Surface((400, 40))
+            expected.blit(
+                game.font.render(f"Score: {score}", True, game.WHITE), (10, 10)
+            )
+            assert pygame.image.tobytes(game.screen, "RGB") == pygame.image.tobytes(
+                expected, "RGB"
+            ), score
+
+
+class TestDirtyRendering:
+    """Tests for incremental (dirty-rect) repainting in draw."""
+
+    @pytest.fixture(autouse=True)
+    def display(self, monkeypatch: pytest.MonkeyPatch) -> dict[str, Mock]:
+        flip: Mock = Mock()
+        display_update: Mock = Mock()
+        monkeypatch.setattr("pygame.display.flip", flip)
+        monkeypatch.setattr("pygame.display.update", display_update)
+        return {"flip": flip, "update": display_update}
+
+    @pytest.fixture
+    def real_screen_game(self, game: SnakeGame) -> SnakeGame:
+        """Game drawing onto a real off-screen surface with solid score glyphs."""
+        import pygame
+
+        game.screen = pygame.Surface((game.WINDOW_WIDTH, game.WINDOW_HEIGHT))
+        game._score_label = pygame.Surface((60, 24))
+        game._score_label.fill(game.WHITE)
+        game._score_label_height = 24
+        game._digit_surfs = []
+        for digit in range(10):
+            surf = pygame.Surface((13, 24))
+            surf.fill((digit * 20, 100, 255 - digit * 20))
+            game._digit_surfs.append(surf)
+        game._digit_widths = [13] * 10
+        return game
+
+    def test_move_presents_only_changed_cells(
+        self, real_screen_game: SnakeGame, display: dict[str, Mock]
+    ) -> None:
+        """Test a plain move repaints the new head, old head and vacated tail."""
+        game = real_screen_game
+        game.snake = [(20, 15), (19, 15), (18, 15)]
+        game.food = (5, 25)
+        game.draw()
+        display["flip"].reset_mock()
+
+        game.update()
+        game.draw()
+
+        display["flip"].assert_not_called()
+        (rects,) = display["update"].call_args.args
+        cell = game.GRID_SIZE
+        assert sorted(rects) == sorted(
+            [
+                (18 * cell, 15 * cell, cell, cell),
+                (20 * cell, 15 * cell, cell, cell),
+                (21 * cell, 15 * cell, cell, cell),
+            ]
+        )
+
+    def test_moved_food_repaints_old_and_new_cell(
+        self, real_screen_game: SnakeGame, display: dict[str, Mock]
+    ) -> None:
+        """Test relocated food clears its old cell and paints the new one."""
+        game = real_screen_game
+        game.snake = [(20, 15)]
+        game.food = (5, 25)
+        game.draw()
+
+        game.food = (30, 5)
+        game.draw()
+
+        (rects,) = display["update"].call_args.args
+        cell = game.GRID_SIZE
+        assert sorted(rects) == sorted(
+            [
+                (20 * cell, 15 * cell, cell, cell),
+                (5 * cell, 25 * cell, cell, cell),
+                (30 * cell, 5 * cell, cell, cell),
+            ]
+        )
+
+    def test_render_state_initialized_before_first_draw(self, game: SnakeGame) -> None:
+        """Test every render-tracking attribute exists straight after __init__."""
+        assert game._repaint_all is True
+        assert game._changed_cells == set()
+        assert game._drawn_head == (-1, -1)
+        assert game._drawn_food == (-1, -1)
+        assert game._drawn_score == -1
+        assert game._drawn_score_width == 0
+        assert game._drawn_overlay == (False, False)
+
+    def test_window_exposed_forces_full_repaint(
+        self,
+        game: SnakeGame,
+        display: dict[str, Mock],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test an exposed window is re-presented even while nothing changes."""
+        import pygame
+
+        monkeypatch.setattr("pygame.draw.rect", Mock())
+        game.paused = True
+        game.draw()
+        game.draw()
+        assert display["flip"].call_count == 1
+
+        event = type("Event", (), {"type": pygame.WINDOWEXPOSED})()
+        monkeypatch.setattr("pygame.event.get", lambda eventtype=None: [event])
+        assert game.handle_input() is True
+        game.draw()
+
+        assert display["flip"].call_count == 2
+
+    def test_changed_cells_bounded_without_draw(self, game: SnakeGame) -> None:
+        """Test update-only loops (bots, headless runs) don't grow the dirty set."""
+        game.snake = [(20, 5)]
+        game.food = (0, 0)
+
+        for turn in [
+            Direction.DOWN,
+            Direction.RIGHT,
+            Direction.UP,
+            Direction.LEFT,
+        ] * 50:
+            game.next_direction = turn
+            game.update()
+
+        assert not game.game_over
+        assert game._changed_cells <= {(20, 5), (20, 6), (21, 6), (21, 5)}
+
+    def test_pause_toggle_repaints_whole_screen(
+        self,
+        game: SnakeGame,
+        display: dict[str, Mock],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test overlay transitions fall back to a full flip."""
+        monkeypatch.setattr("pygame.draw.rect", Mock())
+        game.draw()
+        game.paused = True
+        game.draw()
+        game.paused = False
+        game.draw()
+
+        assert display["flip"].call_count == 3
+        display["update"].assert_not_called()
+
+    def test_dirty_frames_match_full_repaint(self, real_screen_game: SnakeGame) -> None:
+        """Test incremental frames are pixel-identical to repainting everything."""
+        import pygame
+
+        game = real_screen_game
+        # Run along the top rows, under the score, eating as it goes
+        game.snake = [(10, 1), (11, 1), (12, 1)]
+        game.direction = Direction.LEFT
+        game.next_direction = Direction.LEFT
+        game.score = 8
+        game.food = (7, 1)
+        game.draw()
+
+        for turn in [Direction.LEFT] * 9 + [Direction.DOWN] + [Direction.RIGHT] * 12:
+            game.next_direction = turn
+            game.update()
+            game.draw()
+
+        assert game.score == 9
+        incremental = pygame.image.tobytes(game.screen, "RGB")
+        game._repaint_all = True
+        game.draw()
+        assert pygame.image.tobytes(game.screen, "RGB") == incremental
+
+
+class TestRunLoop:
+    """Tests for the sequential and pipelined game loops."""
+
+    @pytest.mark.parametrize(
+        "pipelined", [False, True], ids=["sequential", "pipelined"]
+    )
+    def test_run_updates_each_frame_until_quit(
+        self,
+        game: SnakeGame,
+        mock_pygame: dict[str, Mock],
+        monkeypatch: pytest.MonkeyPatch,
+        pipelined: bool,
+    ) -> None:
+        """Test both loops update and tick once per frame, presenting only changes."""
+        flip: Mock = Mock()
+        display_update: Mock = Mock()
+        monkeypatch.setattr("pygame.draw.rect", Mock())
+        monkeypatch.setattr("pygame.display.flip", flip)
+        monkeypatch.setattr("pygame.display.update", display_update)
+        monkeypatch.setattr(game, "handle_input", Mock(side_effect=[True, True, False]))
+        update: Mock = Mock()
+        monkeypatch.setattr(game, "update", update)
+
+        game.run(fps=60, pipelined=pipelined)
+
+        assert update.call_count == 3
+        # First frame is a full repaint; the stubbed update changes nothing after
+        assert flip.call_count == 1
+        display_update.assert_not_called()
+        mock_pygame["clock"].tick.assert_called_with(60)
+
+
 class TestResetGame:
     """Tests for game reset functionality."""
 
@@ -0,0 +1,175 @@
+"""Tests for the headless Numba step core."""
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+from numba import njit
+
+from app import Direction, snake_core
+
+Board = tuple[npt.NDArray[np.int8], npt.NDArray[np.int16], npt.NDArray[np.int16]]
+
+
+@pytest.fixture
+def board() -> Board:
+    """Fresh grid, body ring buffer and food cell, already reset."""
+    grid = np.zeros((snake_core.GRID_HEIGHT, snake_core.GRID_WIDTH), dtype=np.int8)
+    body = np.zeros((grid.size, 2), dtype=np.int16)
+    food_xy = np.zeros(2, dtype=np.int16)
+    snake_core.seed(0)
+    snake_core.reset(grid, body, food_xy)
+    return grid, body, food_xy
+
+
+def test_reset_places_centered_snake(
+    board: Board,
+) -> None:
+    """Test reset puts a single segment in the centre and food elsewhere."""
+    grid, body, food_xy = board
+    assert tuple(body[0]) == (20, 15)
+    assert grid.sum() == 1
+    assert grid[food_xy[1], food_xy[0]] == 0
+
+
+@pytest.mark.parametrize(
+    "direction,expected",
+    [
+        (Direction.UP, (20, 14)),
+        (Direction.DOWN, (20, 16)),
+        (Direction.LEFT, (19, 15)),
+        (Direction.RIGHT, (21, 15)),
+    ],
+)
+def test_step_moves_head(
+    board: Board,
+    direction: Direction,
+    expected: tuple[int, int],
+) -> None:
+    """Test step advances the head one cell and drops the tail."""
+    grid, body, food_xy = board
+    food_xy[:] = (0, 0)
+
+    head, _, length, reward, done = snake_core.step(
+        grid, body, 0, 0, 1, direction.value, food_xy
+    )
+
+    assert tuple(body[head]) == expected
+    assert (length, reward, done) == (1, 0, False)
+    assert grid.sum() == 1
+    assert grid[expected[1], expected[0]] == 1
+
+
+def test_step_eats_food(
+    board: Board,
+) -> None:
+    """Test eating grows the snake, rewards, and respawns food off the body."""
+    grid, body, food_xy = board
+    food_xy[:] = (21, 15)
+
+    _, tail, length, reward, done = snake_core.step(
+        grid, body, 0, 0, 1, Direction.RIGHT.value, food_xy
+    )
+
+    assert (length, reward, done) == (2, 1, False)
+    assert tail == 0
+    assert grid.sum() == 2
+    assert grid[food_xy[1], food_xy[0]] == 0
+
+
+@pytest.mark.parametrize("direction", [0, -1, 5, 100])
+def test_step_rejects_invalid_direction(board: Board, direction: int) -> None:
+    """Test out-of-range directions end the episode without moving the snake."""
+    grid, body, food_xy = board
+    before = grid.copy()
+
+    head, tail, length, reward, done = snake_core.step(
+        grid, body, 0, 0, 1, direction, food_xy
+    )
+
+    assert (head, tail, length, reward, done) == (0, 0, 1, -1, True)
+    assert (grid == before).all()
+
+
+def test_step_wall_collision(
+    board: Board,
+) -> None:
+    """Test moving off the grid ends the episode."""
+    grid, body, food_xy = board
+    grid[15, 20] = 0
+    body[0] = (0, 5)
+    grid[5, 0] = 1
+
+    *_, reward, done = snake_core.step(
+        grid, body, 0, 0, 1, Direction.LEFT.value, food_xy
+    )
+
+    assert (reward, done) == (-1, True)
+
+
+def test_step_self_collision(
+    board: Board,
+) -> None:
+    """Test running into the body (tail included) ends the episode."""
+    grid, body, food_xy = board
+    grid[:, :] = 0
+    # Tail at index 0, head at index 3: (10, 10) <- (10, 11) <- (11, 11) <- (11, 10)
+    for i, (x, y) in enumerate([(10, 10), (10, 11), (11, 11), (11, 10)]):
+        body[i] = (x, y)
+        grid[y, x] = 1
+    food_xy[:] = (0, 0)
+
+    *_, reward, done = snake_core.step(
+        grid, body, 3, 0, 4, Direction.LEFT.value, food_xy
+    )
+
+    assert (reward, done) == (-1, True)
+
+
+@njit(cache=True)
+def _down_policy(
+    grid: npt.NDArray[np.int8],
+    body: npt.NDArray[np.int16],
+    head_idx: int,
+    direction: int,
+    food_xy: npt.NDArray[np.int16],
+) -> int:
+    return 2
+
+
+def test_headless_run_counts_games() -> None:
+    """Test the compiled loop restarts after each death."""
+    snake_core.warmup(_down_policy)
+    snake_core.seed(0)
+
+    games, _ = snake_core.headless_run(150, _down_policy)
+
+    # From row 15, walking down dies on the 15th step of every game
+    assert games == 10
+
+
+@njit(cache=True)
+def _greedy_policy(
+    grid: npt.NDArray[np.int8],
+    body: npt.NDArray[np.int16],
+    head_idx: int,
+    direction: int,
+    food_xy: npt.NDArray[np.int16],
+) -> int:
+    # Close the x gap first, then y; turning back into the neck just ends the game
+    if food_xy[0] > body[head_idx, 0]:
+        return 4
+    if food_xy[0] < body[head_idx, 0]:
+        return 3
+    if food_xy[1] > body[head_idx, 1]:
+        return 2
+    return 1
+
+
+def test_headless_run_counts_food() -> None:
+    """Test the compiled loop tallies every food eaten across games."""
+    snake_core.seed(0)
+
+    games, eaten = snake_core.headless_run(2000, _greedy_policy)
+
+    # Seeded RNG and a fixed policy make the run fully deterministic
+    assert (games, eaten) == (4, 93)